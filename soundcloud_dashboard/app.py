@@ -3,97 +3,243 @@ SoundCloud Insights Dashboard
 A Flask-based dashboard for exploring your SoundCloud geographic data.
 
 Usage:
-    pip install flask
+    pip install flask flask-compress orjson
     python app.py
 
 Then open http://localhost:5000
+
+For anything beyond local use, serve wsgi.py with a production WSGI server
+instead (see wsgi.py).
 """
 
-from flask import Flask, render_template, jsonify, send_from_directory
-import json
+from flask import Flask, Response, render_template, request, send_from_directory
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
+import hashlib
+import orjson
 import os
 
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson (much faster than the stdlib json)."""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype=self.mimetype)
+
+
+class CompressCache(dict):
+    """In-process store for compressed bodies (responses never change while running)."""
+
+    def set(self, key, value):
+        self[key] = value
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# gzip/br the responses, compressing each path once per encoding (the cache
+# key only includes the encoding from Flask-Compress 1.16 on)
+app.config['COMPRESS_MIMETYPES'] = ['text/html', 'application/json']
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_CACHE_BACKEND'] = CompressCache
+app.config['COMPRESS_CACHE_KEY'] = lambda request: request.path
+Compress(app)
+
+
+def ojson(obj, status=200):
+    """Serialize obj straight to a UTF-8 JSON response (no intermediate str)."""
+    return raw_json(orjson.dumps(obj), status)
+
+
+def raw_json(body, status=200):
+    """Wrap already-serialized JSON bytes in a response."""
+    return Response(body, status=status, mimetype='application/json')
 
 # Load data
 DATA = None
+DATA_ETAG = None           # changes whenever the data file does
+DATA_LAST_MODIFIED = None
+
+# Pre-serialized response bodies, built once by build_cache()
+CACHE = {}
+TRACK_JSON = {}  # urn and bare track id -> serialized track
+COUNTRY_CITIES_JSON = {}  # upper-cased country code -> serialized city list
+COUNTRY_JSON = {}  # upper-cased country code -> serialized country/tracks entry
 
 def load_data():
-    global DATA
+    global DATA, DATA_ETAG, DATA_LAST_MODIFIED
     data_file = os.path.join(os.path.dirname(__file__), 'soundcloud_insights.json')
     if os.path.exists(data_file):
-        with open(data_file, 'r', encoding='utf-8') as f:
-            DATA = json.load(f)
+        with open(data_file, 'rb') as f:
+            DATA = orjson.loads(f.read())
+        stat = os.stat(data_file)
+        DATA_ETAG = hashlib.md5(str((stat.st_mtime, stat.st_size)).encode()).hexdigest()
+        DATA_LAST_MODIFIED = stat.st_mtime
         print(f"✓ Loaded data: {len(DATA.get('tracks', []))} tracks")
     else:
         print(f"⚠ No data file found at {data_file}")
         print("  Run soundcloud_insights.py first to generate data.")
         DATA = {"tracks": [], "aggregate": {"countries": [], "cities": []}, "country_tracks": {}}
+    build_cache()
 
 
-# City coordinates for the map
+# City coordinates (lat, lng) for the map
 CITY_COORDS = {
-    "Chicago": [41.8781, -87.6298],
-    "Montreal": [45.5017, -73.5673],
-    "Hanoi": [21.0285, 105.8542],
-    "Toronto": [43.6532, -79.3832],
-    "Ho Chi Minh City": [10.8231, 106.6297],
-    "Washington": [38.9072, -77.0369],
-    "New York": [40.7128, -74.0060],
-    "Miami": [25.7617, -80.1918],
-    "Kyiv": [50.4501, 30.5234],
-    "Cairo": [30.0444, 31.2357],
-    "Da Nang": [16.0544, 108.2022],
-    "Lviv": [49.8397, 24.0297],
-    "Gangnam-gu": [37.5172, 127.0473],
-    "Denpasar": [-8.6705, 115.2126],
-    "Los Angeles": [34.0522, -118.2437],
-    "Dnipro": [48.4647, 35.0462],
-    "Jakarta": [-6.2088, 106.8456],
-    "Medan": [3.5952, 98.6722],
-    "Frankfurt am Main": [50.1109, 8.6821],
-    "Melbourne": [-37.8136, 144.9631],
-    "Minsk": [53.9006, 27.5590],
-    "Gwanak-gu": [37.4784, 126.9516],
-    "Sydney": [-33.8688, 151.2093],
-    "Riyadh": [24.7136, 46.6753],
-    "Warsaw": [52.2297, 21.0122],
-    "Paris": [48.8566, 2.3522],
-    "Upland": [34.0975, -117.6484],
-    "Wroclaw": [51.1079, 17.0385],
-    "Chisinau": [47.0105, 28.8638],
-    "Jeddah": [21.4858, 39.1925],
-    "Biên Hòa": [10.9574, 106.8426],
-    "Pekanbaru": [0.5071, 101.4478],
-    "Haiphong": [20.8449, 106.6881],
-    "Orlando": [28.5383, -81.3792],
-    "Kuwait City": [29.3759, 47.9774],
-    "Rio de Janeiro": [-22.9068, -43.1729],
-    "Amsterdam": [52.3676, 4.9041],
-    "Seoul": [37.5665, 126.9780],
-    "Brooklyn": [40.6782, -73.9442],
-    "Ulan Bator": [47.8864, 106.9057],
-    "Hải Dương": [20.9373, 106.3146],
-    "Dammam": [26.4207, 50.0888],
-    "Dongjak-gu": [37.5124, 126.9393],
-    "Riverside": [33.9533, -117.3962],
-    "The Bronx": [40.8448, -73.8648],
-    "Surabaya": [-7.2575, 112.7521],
-    "Lahore": [31.5204, 74.3587],
-    "Singapore": [1.3521, 103.8198],
-    "Buon Ma Thuot": [12.6667, 108.0500],
-    "Vilnius": [54.6872, 25.2797],
-    "London": [51.5074, -0.1278],
-    "Berlin": [52.5200, 13.4050],
-    "Tokyo": [35.6762, 139.6503],
-    "Bangkok": [13.7563, 100.5018],
-    "Mumbai": [19.0760, 72.8777],
-    "São Paulo": [-23.5505, -46.6333],
-    "Mexico City": [19.4326, -99.1332],
-    "Dubai": [25.2048, 55.2708],
+    "Chicago": (41.8781, -87.6298),
+    "Montreal": (45.5017, -73.5673),
+    "Hanoi": (21.0285, 105.8542),
+    "Toronto": (43.6532, -79.3832),
+    "Ho Chi Minh City": (10.8231, 106.6297),
+    "Washington": (38.9072, -77.0369),
+    "New York": (40.7128, -74.0060),
+    "Miami": (25.7617, -80.1918),
+    "Kyiv": (50.4501, 30.5234),
+    "Cairo": (30.0444, 31.2357),
+    "Da Nang": (16.0544, 108.2022),
+    "Lviv": (49.8397, 24.0297),
+    "Gangnam-gu": (37.5172, 127.0473),
+    "Denpasar": (-8.6705, 115.2126),
+    "Los Angeles": (34.0522, -118.2437),
+    "Dnipro": (48.4647, 35.0462),
+    "Jakarta": (-6.2088, 106.8456),
+    "Medan": (3.5952, 98.6722),
+    "Frankfurt am Main": (50.1109, 8.6821),
+    "Melbourne": (-37.8136, 144.9631),
+    "Minsk": (53.9006, 27.5590),
+    "Gwanak-gu": (37.4784, 126.9516),
+    "Sydney": (-33.8688, 151.2093),
+    "Riyadh": (24.7136, 46.6753),
+    "Warsaw": (52.2297, 21.0122),
+    "Paris": (48.8566, 2.3522),
+    "Upland": (34.0975, -117.6484),
+    "Wroclaw": (51.1079, 17.0385),
+    "Chisinau": (47.0105, 28.8638),
+    "Jeddah": (21.4858, 39.1925),
+    "Biên Hòa": (10.9574, 106.8426),
+    "Pekanbaru": (0.5071, 101.4478),
+    "Haiphong": (20.8449, 106.6881),
+    "Orlando": (28.5383, -81.3792),
+    "Kuwait City": (29.3759, 47.9774),
+    "Rio de Janeiro": (-22.9068, -43.1729),
+    "Amsterdam": (52.3676, 4.9041),
+    "Seoul": (37.5665, 126.9780),
+    "Brooklyn": (40.6782, -73.9442),
+    "Ulan Bator": (47.8864, 106.9057),
+    "Hải Dương": (20.9373, 106.3146),
+    "Dammam": (26.4207, 50.0888),
+    "Dongjak-gu": (37.5124, 126.9393),
+    "Riverside": (33.9533, -117.3962),
+    "The Bronx": (40.8448, -73.8648),
+    "Surabaya": (-7.2575, 112.7521),
+    "Lahore": (31.5204, 74.3587),
+    "Singapore": (1.3521, 103.8198),
+    "Buon Ma Thuot": (12.6667, 108.0500),
+    "Vilnius": (54.6872, 25.2797),
+    "London": (51.5074, -0.1278),
+    "Berlin": (52.5200, 13.4050),
+    "Tokyo": (35.6762, 139.6503),
+    "Bangkok": (13.7563, 100.5018),
+    "Mumbai": (19.0760, 72.8777),
+    "São Paulo": (-23.5505, -46.6333),
+    "Mexico City": (19.4326, -99.1332),
+    "Dubai": (25.2048, 55.2708),
 }
 
 
+def build_cache():
+    """Serialize the static API responses once, since DATA never changes after load."""
+    tracks = DATA.get('tracks', [])
+    countries = DATA.get('aggregate', {}).get('countries', [])
+    cities = DATA.get('aggregate', {}).get('cities', [])
+    
+    CACHE.clear()
+    CACHE['summary'] = orjson.dumps({
+        "total_plays": sum(t.get('plays', 0) for t in tracks),
+        "total_tracks": len(tracks),
+        "total_countries": len(countries),
+        "total_cities": len(cities),
+        "top_track": tracks[0].get('title', 'N/A') if tracks else 'N/A',
+        "top_track_plays": tracks[0].get('plays', 0) if tracks else 0,
+        "username": DATA.get('user', {}).get('username', 'unknown'),
+    })
+    CACHE['tracks'] = orjson.dumps(tracks)
+    
+    # Index tracks by full urn and by bare id (the last urn segment)
+    TRACK_JSON.clear()
+    for track in tracks:
+        urn = track.get('urn', '')
+        body = orjson.dumps(track)
+        TRACK_JSON.setdefault(urn.split(':')[-1], body)
+        TRACK_JSON[urn] = body
+    CACHE['countries'] = orjson.dumps(countries)
+    
+    # Join coordinates in one pass: /api/cities gets every city (with lat/lng
+    # where known), the map only gets the cities we can place
+    cities_with_coords = []
+    map_cities = []
+    for city in cities:
+        coords = CITY_COORDS.get(city['name'])
+        if coords is None:
+            cities_with_coords.append(city)
+            continue
+        lat, lng = coords
+        cities_with_coords.append({**city, "lat": lat, "lng": lng})
+        map_cities.append({
+            "name": city['name'],
+            "country": city.get('country', ''),
+            "country_code": city.get('country_code', ''),
+            "plays": city['plays'],
+            "lat": lat,
+            "lng": lng
+        })
+    CACHE['cities'] = orjson.dumps(cities_with_coords)
+    
+    # Country -> tracks entries (already sorted by plays when generated)
+    COUNTRY_JSON.clear()
+    COUNTRY_JSON.update(
+        (code.upper(), orjson.dumps(entry))
+        for code, entry in DATA.get('country_tracks', {}).items() if entry
+    )
+    
+    # Group cities by country code
+    cities_by_country = {}
+    for city in cities:
+        cities_by_country.setdefault(city.get('country_code', '').upper(), []).append(city)
+    COUNTRY_CITIES_JSON.clear()
+    COUNTRY_CITIES_JSON.update((code, orjson.dumps(c)) for code, c in cities_by_country.items())
+    
+    # Create country code -> plays mapping
+    country_plays = {c['code']: c['plays'] for c in countries}
+    
+    CACHE['map-data'] = orjson.dumps({
+        "cities": map_cities,
+        "country_plays": country_plays
+    })
+
+
+@app.after_request
+def add_cache_headers(response):
+    """Tag API responses with the data file's ETag and answer revalidations with 304."""
+    if DATA_ETAG and request.path.startswith('/api/') and response.status_code == 200:
+        response.set_etag(DATA_ETAG)
+        response.last_modified = DATA_LAST_MODIFIED
+        response.headers['Cache-Control'] = 'public, max-age=60'
+        # Checked after routing, so only real 200s can become 304s. Compressed
+        # responses (ETag with an ":<encoding>" suffix) are matched by
+        # Flask-Compress, whose hook runs after this one.
+        response.make_conditional(request)
+    return response
+
+
 @app.route('/')
 def index():
     """Main dashboard page."""
@@ -104,26 +250,15 @@ def index():
 def api_summary():
     """Get summary stats."""
     if not DATA:
-        return jsonify({"error": "No data loaded"})
-    
-    total_plays = sum(t.get('plays', 0) for t in DATA.get('tracks', []))
+        return ojson({"error": "No data loaded"})
     
-    return jsonify({
-        "total_plays": total_plays,
-        "total_tracks": len(DATA.get('tracks', [])),
-        "total_countries": len(DATA.get('aggregate', {}).get('countries', [])),
-        "total_cities": len(DATA.get('aggregate', {}).get('cities', [])),
-        "top_track": DATA.get('tracks', [{}])[0].get('title', 'N/A') if DATA.get('tracks') else 'N/A',
-        "top_track_plays": DATA.get('tracks', [{}])[0].get('plays', 0) if DATA.get('tracks') else 0,
-        "username": DATA.get('user', {}).get('username', 'unknown'),
-    })
+    return raw_json(CACHE['summary'])
 
 
 @app.route('/api/tracks')
 def api_tracks():
     """Get all tracks."""
-    tracks = DATA.get('tracks', [])
-    return jsonify(tracks)
+    return raw_json(CACHE['tracks'])
 
 
 @app.route('/api/track/<track_urn>')
@@ -132,89 +267,49 @@ def api_track(track_urn):
     # Handle URL-encoded colons
     track_urn = track_urn.replace('%3A', ':')
     
-    for track in DATA.get('tracks', []):
-        if track.get('urn') == track_urn or track.get('urn', '').endswith(track_urn):
-            return jsonify(track)
+    body = TRACK_JSON.get(track_urn)
+    if body:
+        return raw_json(body)
     
-    return jsonify({"error": "Track not found"}), 404
+    return ojson({"error": "Track not found"}, 404)
 
 
 @app.route('/api/countries')
 def api_countries():
     """Get aggregate country data."""
-    countries = DATA.get('aggregate', {}).get('countries', [])
-    return jsonify(countries)
+    return raw_json(CACHE['countries'])
 
 
 @app.route('/api/country/<country_code>')
 def api_country(country_code):
     """Get tracks for a specific country."""
-    country_data = DATA.get('country_tracks', {}).get(country_code.upper())
+    body = COUNTRY_JSON.get(country_code.upper())
+    if body:
+        return raw_json(body)
     
-    if country_data:
-        return jsonify(country_data)
-    
-    return jsonify({"error": "Country not found"}), 404
+    return ojson({"error": "Country not found"}, 404)
 
 
 @app.route('/api/country/<country_code>/cities')
 def api_country_cities(country_code):
     """Get cities for a specific country."""
-    all_cities = DATA.get('aggregate', {}).get('cities', [])
-    country_cities = [c for c in all_cities if c.get('country_code', '').upper() == country_code.upper()]
-    
-    return jsonify(country_cities)
+    return raw_json(COUNTRY_CITIES_JSON.get(country_code.upper(), b'[]'))
 
 
 @app.route('/api/cities')
 def api_cities():
     """Get aggregate city data with coordinates."""
-    cities = DATA.get('aggregate', {}).get('cities', [])
-    
-    # Add coordinates
-    cities_with_coords = []
-    for city in cities:
-        city_copy = city.copy()
-        coords = CITY_COORDS.get(city['name'])
-        if coords:
-            city_copy['lat'] = coords[0]
-            city_copy['lng'] = coords[1]
-        cities_with_coords.append(city_copy)
-    
-    return jsonify(cities_with_coords)
+    return raw_json(CACHE['cities'])
 
 
 @app.route('/api/map-data')
 def api_map_data():
     """Get all data needed for the map."""
-    cities = DATA.get('aggregate', {}).get('cities', [])
-    countries = DATA.get('aggregate', {}).get('countries', [])
-    
-    # Add coordinates to cities
-    cities_with_coords = []
-    for city in cities:
-        coords = CITY_COORDS.get(city['name'])
-        if coords:
-            cities_with_coords.append({
-                "name": city['name'],
-                "country": city.get('country', ''),
-                "country_code": city.get('country_code', ''),
-                "plays": city['plays'],
-                "lat": coords[0],
-                "lng": coords[1]
-            })
-    
-    # Create country code -> plays mapping
-    country_plays = {c['code']: c['plays'] for c in countries}
-    
-    return jsonify({
-        "cities": cities_with_coords,
-        "country_plays": country_plays
-    })
+    return raw_json(CACHE['map-data'])
 
 
 if __name__ == '__main__':
     load_data()
     print("\n🚀 Starting SoundCloud Insights Dashboard")
     print("   Open http://localhost:5000 in your browser\n")
-    app.run(debug=True, port=5000)
+    app.run(port=5000)
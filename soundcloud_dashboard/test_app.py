@@ -0,0 +1,30 @@
+"""Tests for the dashboard's orjson JSON provider."""
+
+from flask import Flask, jsonify
+
+from app import OrjsonProvider, app
+
+
+def test_jsonify_uses_orjson_provider():
+    with app.app_context():
+        response = jsonify({"a": 1, "city": "Hải Dương"})
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert response.get_json() == {"a": 1, "city": "Hải Dương"}
+
+
+def test_dict_and_list_returning_routes():
+    probe = Flask(__name__)
+    probe.json = OrjsonProvider(probe)
+    probe.add_url_rule("/dict", "dict", lambda: {"ok": True})
+    probe.add_url_rule("/list", "list", lambda: [1, 2, 3])
+    client = probe.test_client()
+
+    response = client.get("/dict")
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert response.get_json() == {"ok": True}
+
+    response = client.get("/list")
+    assert response.status_code == 200
+    assert response.get_json() == [1, 2, 3]
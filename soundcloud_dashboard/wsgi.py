@@ -0,0 +1,17 @@
+"""
+WSGI entry point for serving the dashboard with a production server.
+
+Usage:
+    pip install gunicorn
+    gunicorn -w 4 -k gthread --threads 4 wsgi:application
+
+On Windows (gunicorn is Unix-only):
+    pip install waitress
+    waitress-serve --port=5000 wsgi:application
+"""
+
+from app import app, load_data
+
+# Each worker loads the data (and builds its response cache) once at import
+load_data()
+application = app
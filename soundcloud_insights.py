@@ -20,28 +20,26 @@ Output:
 """
 
 import csv
-import json
+import orjson
 import os
 import requests
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Load from .env file if it exists
-def load_env():
-    env_file = os.path.join(os.path.dirname(__file__), '.env')
-    if os.path.exists(env_file):
-        with open(env_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ.setdefault(key.strip(), value.strip())
-
-load_env()
+# Load from .env file if it exists (existing environment variables win)
+load_dotenv(os.path.join(os.path.dirname(__file__), '.env'))
 
 # Configuration
 OAUTH_TOKEN = os.environ.get("SOUNDCLOUD_OAUTH_TOKEN")
 GRAPHQL_URL = "https://graph.soundcloud.com/graphql"
 REST_API_BASE = "https://api-v2.soundcloud.com"
+MAX_WORKERS = 8              # concurrent per-track geo fetches
+MIN_REQUEST_INTERVAL = 0.1   # seconds between GraphQL requests, across all threads
+PROGRESS_EVERY = 10          # print a progress line every N tracks (console writes are slow)
 
 if not OAUTH_TOKEN:
     print("❌ Error: SOUNDCLOUD_OAUTH_TOKEN environment variable not set.")
@@ -79,6 +77,39 @@ HEADERS_REST = {
 }
 
 
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def make_session(headers, retry=True):
+    """Build a keep-alive session; with retry, urllib3 retries transient failures."""
+    session = requests.Session()
+    session.headers.update(headers)
+    max_retries = 0
+    if retry:
+        max_retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=max_retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# One pooled session per host so every call reuses the same TLS connection
+# (graphql_request retries GraphQL calls itself, through the rate limiter)
+SESSION = make_session(HEADERS, retry=False)
+REST_SESSION = make_session(HEADERS_REST)
+
+
+def parse_json(response):
+    """Decode a JSON response body straight from bytes with orjson."""
+    return orjson.loads(response.content)
+
+
 def get_all_tracks_rest():
     """Fetch ALL tracks via REST API (no 50 limit)."""
     # First get user ID from token
@@ -93,11 +124,11 @@ def get_all_tracks_rest():
     params = {"limit": 50, "offset": 0, "linked_partitioning": 1}
     
     while True:
-        response = requests.get(url, headers=HEADERS_REST, params=params)
+        response = REST_SESSION.get(url, params=params)
         if response.status_code != 200:
             break
         
-        data = response.json()
+        data = parse_json(response)
         batch = data.get("collection", [])
         tracks.extend(batch)
         
@@ -141,6 +172,29 @@ query TopCountriesByWindow($metric: MetricType!, $windowInput: TimeWindowInput!,
 }
 """
 
+# Countries and cities for one track in a single round-trip
+QUERY_TRACK_GEO = """
+query TrackGeo($metric: MetricType!, $windowInput: TimeWindowInput!, $trackUrn: String) {
+  countries: topCountriesByWindow(metric: $metric, windowInput: $windowInput, trackUrn: $trackUrn) {
+    count
+    country {
+      name
+      countryCode
+    }
+  }
+  cities: topCitiesByWindow(metric: $metric, windowInput: $windowInput, trackUrn: $trackUrn) {
+    count
+    city {
+      name
+      country {
+        name
+        countryCode
+      }
+    }
+  }
+}
+"""
+
 QUERY_TOP_TRACKS = """
 query TopTracksByWindow($metric: MetricType!, $windowInput: TimeWindowInput!) {
   topTracksByWindow(metric: $metric, windowInput: $windowInput) {
@@ -175,26 +229,62 @@ query Me {
 }
 """
 
+# Operation name -> query document
+OPERATIONS = {
+    "Me": QUERY_ME,
+    "TopCitiesByWindow": QUERY_TOP_CITIES,
+    "TopCountriesByWindow": QUERY_TOP_COUNTRIES,
+    "TopTracksByWindow": QUERY_TOP_TRACKS,
+    "TrackGeo": QUERY_TRACK_GEO,
+}
+
+
+class RateLimiter:
+    """Space out calls so they start at most once per min_interval, across threads."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.min_interval
+        if delay > 0:
+            time.sleep(delay)
 
-def graphql_request(query, variables=None, operation_name=None, retries=3):
+
+rate_limiter = RateLimiter(MIN_REQUEST_INTERVAL)
+
+
+def graphql_request(operation_name, variables=None, retries=3):
     """Make a GraphQL request to SoundCloud with retry logic."""
-    payload = {
-        "query": query,
+    # Encode once up front; retries resend the same bytes
+    body = orjson.dumps({
+        "query": OPERATIONS[operation_name],
         "variables": variables or {},
-    }
-    if operation_name:
-        payload["operationName"] = operation_name
+        "operationName": operation_name,
+    })
     
     for attempt in range(retries):
         try:
-            response = requests.post(GRAPHQL_URL, headers=HEADERS, json=payload, timeout=30)
+            rate_limiter.wait()
+            response = SESSION.post(GRAPHQL_URL, data=body, timeout=30)
+            
+            if response.status_code in RETRY_STATUSES and attempt < retries - 1:
+                wait_time = (attempt + 1) * 5  # 5s, 10s
+                print(f"\n   ⚠️ HTTP {response.status_code}, retrying in {wait_time}s... ({attempt + 1}/{retries})")
+                time.sleep(wait_time)
+                continue
             
             if response.status_code != 200:
                 print(f"❌ Error: {response.status_code}")
                 print(f"   Response: {response.text[:500]}")
                 return None
             
-            data = response.json()
+            data = parse_json(response)
             if "errors" in data:
                 print(f"❌ GraphQL Error: {data['errors']}")
                 return None
@@ -213,7 +303,7 @@ def graphql_request(query, variables=None, operation_name=None, retries=3):
 
 def get_me():
     """Get current user info."""
-    return graphql_request(QUERY_ME, operation_name="Me")
+    return graphql_request("Me")
 
 
 def get_top_cities(timewindow="DAYS_30", limit=200, track_urn=None):
@@ -223,7 +313,7 @@ def get_top_cities(timewindow="DAYS_30", limit=200, track_urn=None):
         "windowInput": {"timewindow": timewindow, "limit": limit},
         "trackUrn": track_urn
     }
-    return graphql_request(QUERY_TOP_CITIES, variables, "TopCitiesByWindow")
+    return graphql_request("TopCitiesByWindow", variables)
 
 
 def get_top_countries(timewindow="DAYS_30", limit=200, track_urn=None):
@@ -233,7 +323,17 @@ def get_top_countries(timewindow="DAYS_30", limit=200, track_urn=None):
         "windowInput": {"timewindow": timewindow, "limit": limit},
         "trackUrn": track_urn
     }
-    return graphql_request(QUERY_TOP_COUNTRIES, variables, "TopCountriesByWindow")
+    return graphql_request("TopCountriesByWindow", variables)
+
+
+def get_track_geo(track_urn, timewindow="ALL_TIME", limit=200):
+    """Get top countries and cities by plays for a track in one request."""
+    variables = {
+        "metric": "PLAYS",
+        "windowInput": {"timewindow": timewindow, "limit": limit},
+        "trackUrn": track_urn
+    }
+    return graphql_request("TrackGeo", variables)
 
 
 def get_top_tracks(timewindow="DAYS_30", limit=500):
@@ -242,7 +342,43 @@ def get_top_tracks(timewindow="DAYS_30", limit=500):
         "metric": "PLAYS",
         "windowInput": {"timewindow": timewindow, "limit": limit}
     }
-    return graphql_request(QUERY_TOP_TRACKS, variables, "TopTracksByWindow")
+    return graphql_request("TopTracksByWindow", variables)
+
+
+def fetch_track_geo(track_item):
+    """Fetch countries and cities for one track and build its output record."""
+    track = track_item["track"]
+    track_urn = track["urn"]
+    
+    geo_data = get_track_geo(track_urn) or {}
+    track_countries = geo_data.get("countries") or []
+    track_cities = geo_data.get("cities") or []
+    
+    return {
+        "urn": track_urn,
+        "title": track["title"],
+        "plays": track_item["count"],
+        "url": track["permalinkUrl"],
+        "artwork": track["artworkUrl"],
+        "created_at": track["createdAt"][:10] if track["createdAt"] else "",
+        "countries": [
+            {
+                "name": c["country"]["name"],
+                "code": c["country"]["countryCode"],
+                "plays": c["count"]
+            }
+            for c in track_countries
+        ],
+        "cities": [
+            {
+                "name": c["city"]["name"],
+                "country": c["city"]["country"]["name"],
+                "country_code": c["city"]["country"]["countryCode"],
+                "plays": c["count"]
+            }
+            for c in track_cities
+        ]
+    }
 
 
 def main():
@@ -315,61 +451,20 @@ def main():
     print(f"\n📊 Fetching per-track geographic data for {len(tracks)} tracks...")
     print("-" * 55)
     
-    tracks_with_geo = []
     total_tracks = len(tracks)
+    tracks_with_geo = [None] * total_tracks
     
-    for i, track_item in enumerate(tracks, 1):
-        track = track_item["track"]
-        track_urn = track["urn"]
-        title = track["title"][:35]
-        
-        print(f"   [{i}/{total_tracks}] {title}...", end=" ", flush=True)
-        
-        # Get countries for this track
-        countries_data = get_top_countries(timewindow="ALL_TIME", track_urn=track_urn)
-        track_countries = []
-        if countries_data and countries_data.get("topCountriesByWindow"):
-            track_countries = countries_data["topCountriesByWindow"]
-        
-        # Small delay to be nice to the API
-        time.sleep(0.5)
-        
-        # Get cities for this track
-        cities_data = get_top_cities(timewindow="ALL_TIME", track_urn=track_urn)
-        track_cities = []
-        if cities_data and cities_data.get("topCitiesByWindow"):
-            track_cities = cities_data["topCitiesByWindow"]
-        
-        print(f"✓ {len(track_countries)} countries, {len(track_cities)} cities")
-        
-        tracks_with_geo.append({
-            "urn": track_urn,
-            "title": track["title"],
-            "plays": track_item["count"],
-            "url": track["permalinkUrl"],
-            "artwork": track["artworkUrl"],
-            "created_at": track["createdAt"][:10] if track["createdAt"] else "",
-            "countries": [
-                {
-                    "name": c["country"]["name"],
-                    "code": c["country"]["countryCode"],
-                    "plays": c["count"]
-                }
-                for c in track_countries
-            ],
-            "cities": [
-                {
-                    "name": c["city"]["name"],
-                    "country": c["city"]["country"]["name"],
-                    "country_code": c["city"]["country"]["countryCode"],
-                    "plays": c["count"]
-                }
-                for c in track_cities
-            ]
-        })
-        
-        # Rate limit protection
-        time.sleep(0.5)
+    # Requests are I/O-bound, so fetch tracks concurrently; rate_limiter keeps
+    # the overall request rate polite. Results are slotted back by index to
+    # preserve the plays ordering.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(fetch_track_geo, t): i for i, t in enumerate(tracks)}
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            tracks_with_geo[futures[future]] = result
+            if done % PROGRESS_EVERY == 0 or done == total_tracks:
+                print(f"   [{done}/{total_tracks}] {result['title'][:35]}... "
+                      f"✓ {len(result['countries'])} countries, {len(result['cities'])} cities")
     
     # Build country -> tracks mapping
     print("\n🔄 Building country-to-tracks mapping...")
@@ -425,30 +520,36 @@ def main():
         "country_tracks": country_tracks,
     }
     
-    with open("soundcloud_insights.json", "w", encoding="utf-8") as f:
-        json.dump(all_data, f, indent=2, ensure_ascii=False)
+    with open("soundcloud_insights.json", "wb") as f:
+        f.write(orjson.dumps(all_data, option=orjson.OPT_INDENT_2))
     print("   ✓ soundcloud_insights.json")
     
     # Also save CSVs for convenience
     with open("soundcloud_countries.csv", "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(["rank", "country", "country_code", "plays"])
-        for i, c in enumerate(agg_countries, 1):
-            writer.writerow([i, c["country"]["name"], c["country"]["countryCode"], c["count"]])
+        writer.writerows(
+            (i, c["country"]["name"], c["country"]["countryCode"], c["count"])
+            for i, c in enumerate(agg_countries, 1)
+        )
     print("   ✓ soundcloud_countries.csv")
     
     with open("soundcloud_cities.csv", "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(["rank", "city", "country", "country_code", "plays"])
-        for i, c in enumerate(agg_cities, 1):
-            writer.writerow([i, c["city"]["name"], c["city"]["country"]["name"], c["city"]["country"]["countryCode"], c["count"]])
+        writer.writerows(
+            (i, c["city"]["name"], c["city"]["country"]["name"], c["city"]["country"]["countryCode"], c["count"])
+            for i, c in enumerate(agg_cities, 1)
+        )
     print("   ✓ soundcloud_cities.csv")
     
     with open("soundcloud_top_tracks.csv", "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(["rank", "title", "plays", "url", "created_at"])
-        for i, t in enumerate(tracks, 1):
-            writer.writerow([i, t["track"]["title"], t["count"], t["track"]["permalinkUrl"], t["track"]["createdAt"][:10] if t["track"]["createdAt"] else ""])
+        writer.writerows(
+            (i, t["track"]["title"], t["count"], t["track"]["permalinkUrl"], t["track"]["createdAt"][:10] if t["track"]["createdAt"] else "")
+            for i, t in enumerate(tracks, 1)
+        )
     print("   ✓ soundcloud_top_tracks.csv")
     
     # Summary
@@ -16,25 +16,26 @@ Output: soundcloud_metrics.csv, soundcloud_metrics.json
 """
 
 import csv
-import json
+import orjson
 import os
 import requests
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Load from .env file if it exists
-def load_env():
-    env_file = os.path.join(os.path.dirname(__file__), '.env')
-    if os.path.exists(env_file):
-        with open(env_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ.setdefault(key.strip(), value.strip())
-
-load_env()
+# Load from .env file if it exists (existing environment variables win)
+load_dotenv(os.path.join(os.path.dirname(__file__), '.env'))
 
 # Configuration
 OUTPUT_FILE = "soundcloud_metrics.csv"
+PROGRESS_EVERY = 10  # print a progress line every N tracks (console writes are slow)
+FIELDNAMES = ['title', 'url', 'plays', 'likes', 'reposts', 'comments',
+              'downloads', 'upload_date', 'duration', 'genre', 'tags', 'description']
+
+# One output row, in FIELDNAMES (= CSV column) order
+TrackStats = namedtuple('TrackStats', FIELDNAMES)
 OAUTH_TOKEN = os.environ.get("SOUNDCLOUD_OAUTH_TOKEN")
 
 if not OAUTH_TOKEN:
@@ -61,6 +62,8 @@ except:
 
 # SoundCloud API endpoints
 API_BASE = "https://api-v2.soundcloud.com"
+PAGE_SIZE = 50
+MAX_WORKERS = 8  # concurrent page fetches
 
 HEADERS = {
     "Authorization": f"OAuth {OAUTH_TOKEN}",
@@ -71,48 +74,104 @@ HEADERS = {
 }
 
 
+def make_session(headers):
+    """Build a keep-alive session that retries transient failures."""
+    session = requests.Session()
+    session.headers.update(headers)
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Pooled session so paginated calls reuse the same TLS connection
+SESSION = make_session(HEADERS)
+
+
+def parse_json(response):
+    """Decode a JSON response body straight from bytes with orjson."""
+    return orjson.loads(response.content)
+
+
 def get_user_info():
     """Get current user info to verify auth works."""
     url = f"{API_BASE}/me"
-    response = requests.get(url, headers=HEADERS)
+    response = SESSION.get(url)
     
     if response.status_code == 200:
-        return response.json()
+        return parse_json(response)
     else:
         print(f"❌ Auth failed: {response.status_code}")
         print(f"   Response: {response.text[:200]}")
         return None
 
 
+def fetch_tracks_page(url, offset):
+    """Fetch one page of tracks at an explicit offset."""
+    params = {
+        "limit": PAGE_SIZE,
+        "offset": offset,
+        "linked_partitioning": 1,
+    }
+    response = SESSION.get(url, params=params)
+    
+    if response.status_code != 200:
+        print(f"⚠️  Error fetching tracks at offset {offset}: {response.status_code}")
+        return []
+    
+    return parse_json(response).get("collection", [])
+
+
 def get_all_tracks(user_id, limit=200):
     """Fetch all tracks for a user."""
     tracks = []
     url = f"{API_BASE}/users/{user_id}/tracks"
     params = {
-        "limit": 50,
+        "limit": PAGE_SIZE,
         "offset": 0,
         "linked_partitioning": 1,
     }
     
-    while True:
-        response = requests.get(url, headers=HEADERS, params=params)
-        
-        if response.status_code != 200:
-            print(f"⚠️  Error fetching tracks: {response.status_code}")
-            break
-        
-        data = response.json()
-        batch = data.get("collection", [])
-        tracks.extend(batch)
-        
-        print(f"  Fetched {len(tracks)} tracks...", end='\r')
-        
+    response = SESSION.get(url, params=params)
+    
+    if response.status_code != 200:
+        print(f"⚠️  Error fetching tracks: {response.status_code}")
+        return tracks
+    
+    data = parse_json(response)
+    tracks.extend(data.get("collection", []))
+    print(f"  Fetched {len(tracks)} tracks...", end='\r')
+    
+    total = data.get("total_results")
+    if total:
+        # Page offsets are known up front, so fetch the rest in parallel
+        # (map() keeps the pages in offset order)
+        offsets = range(PAGE_SIZE, min(total, limit), PAGE_SIZE)
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for batch in executor.map(lambda offset: fetch_tracks_page(url, offset), offsets):
+                tracks.extend(batch)
+                print(f"  Fetched {len(tracks)} tracks...", end='\r')
+    else:
+        # No total to plan around, follow next_href page by page
         next_href = data.get("next_href")
-        if next_href and len(tracks) < limit:
-            url = next_href
-            params = {}
-        else:
-            break
+        while next_href and len(tracks) < limit:
+            response = SESSION.get(next_href)
+            
+            if response.status_code != 200:
+                print(f"⚠️  Error fetching tracks: {response.status_code}")
+                break
+            
+            data = parse_json(response)
+            tracks.extend(data.get("collection", []))
+            print(f"  Fetched {len(tracks)} tracks...", end='\r')
+            next_href = data.get("next_href")
     
     print(f"  Fetched {len(tracks)} tracks total")
     return tracks
@@ -130,20 +189,20 @@ def format_duration(ms):
 
 def extract_track_stats(track):
     """Extract relevant stats from track API response."""
-    return {
-        'title': track.get('title', ''),
-        'url': track.get('permalink_url', ''),
-        'plays': track.get('playback_count', 0) or 0,
-        'likes': track.get('likes_count', 0) or 0,
-        'reposts': track.get('reposts_count', 0) or 0,
-        'comments': track.get('comment_count', 0) or 0,
-        'downloads': track.get('download_count', 0) or 0,
-        'upload_date': track.get('created_at', '')[:10] if track.get('created_at') else '',
-        'duration': format_duration(track.get('duration')),
-        'genre': track.get('genre', ''),
-        'tags': track.get('tag_list', ''),
-        'description': (track.get('description', '') or '')[:500],
-    }
+    return TrackStats(
+        title=track.get('title', ''),
+        url=track.get('permalink_url', ''),
+        plays=track.get('playback_count', 0) or 0,
+        likes=track.get('likes_count', 0) or 0,
+        reposts=track.get('reposts_count', 0) or 0,
+        comments=track.get('comment_count', 0) or 0,
+        downloads=track.get('download_count', 0) or 0,
+        upload_date=track.get('created_at', '')[:10] if track.get('created_at') else '',
+        duration=format_duration(track.get('duration')),
+        genre=track.get('genre', ''),
+        tags=track.get('tag_list', ''),
+        description=(track.get('description', '') or '')[:500],
+    )
 
 
 def main():
@@ -179,22 +238,20 @@ def main():
     for i, track in enumerate(tracks, 1):
         stats = extract_track_stats(track)
         all_stats.append(stats)
-        print(f"  [{i}/{len(tracks)}] {stats['title'][:40]}... ✓ {stats['plays']:,} plays")
+        if i % PROGRESS_EVERY == 0 or i == len(tracks):
+            print(f"  [{i}/{len(tracks)}] {stats.title[:40]}... ✓ {stats.plays:,} plays")
     
     # Write CSV
     print(f"\n💾 Writing to {OUTPUT_FILE}...")
     
-    fieldnames = ['title', 'url', 'plays', 'likes', 'reposts', 'comments', 
-                  'downloads', 'upload_date', 'duration', 'genre', 'tags', 'description']
-    
     with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+        writer = csv.writer(f)
+        writer.writerow(FIELDNAMES)
         writer.writerows(all_stats)
     
     # Summary
-    total_plays = sum(s['plays'] for s in all_stats)
-    total_likes = sum(s['likes'] for s in all_stats)
+    total_plays = sum(s.plays for s in all_stats)
+    total_likes = sum(s.likes for s in all_stats)
     
     print("\n" + "=" * 50)
     print("✅ COMPLETE!")
@@ -206,8 +263,8 @@ def main():
     
     # Also save JSON
     json_file = OUTPUT_FILE.replace('.csv', '.json')
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(all_stats, f, indent=2, ensure_ascii=False)
+    with open(json_file, 'wb') as f:
+        f.write(orjson.dumps([s._asdict() for s in all_stats], option=orjson.OPT_INDENT_2))
     print(f"   Also saved: {json_file}")
 
 